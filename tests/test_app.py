@@ -2,93 +2,131 @@
 Tests for Mergington High School API
 """
 
+from urllib.parse import quote
+
 import pytest
 from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
-
-# Add the src directory to the path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from app import app, activities
 
+NEW_STUDENT_EMAIL = "newstudent@mergington.edu"
+
+
+def build_signup_url(activity_name, email=NEW_STUDENT_EMAIL):
+    """Build a signup URL with the activity name and email percent-encoded"""
+    return f"/activities/{quote(activity_name)}/signup?email={quote(email)}"
+
+
+# Signup URL for the most frequently posted signup, encoded once at import
+CHESS_SIGNUP_URL = build_signup_url("Chess Club")
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+    """Create a test client for the FastAPI app, shared across the session"""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
-@pytest.fixture
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Soccer Team": {
-            "description": "Competitive soccer practices and inter-school matches",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 20,
-            "participants": ["liam@mergington.edu", "ava@mergington.edu"]
-        },
-        "Basketball Club": {
-            "description": "Skills training, pick-up games, and intramural tournaments",
-            "schedule": "Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["mason@mergington.edu", "isabella@mergington.edu"]
-        },
-        "Art Club": {
-            "description": "Explore drawing, painting, and mixed media projects",
-            "schedule": "Mondays, 3:30 PM - 5:00 PM",
-            "max_participants": 15,
-            "participants": ["mia@mergington.edu", "lucas@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Acting workshops and stage productions throughout the year",
-            "schedule": "Thursdays, 4:00 PM - 6:00 PM",
-            "max_participants": 25,
-            "participants": ["amelia@mergington.edu", "harper@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Prepare for debates, polish public speaking and critical thinking",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["ethan@mergington.edu", "oliver@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Hands-on experiments, STEM projects, and science fairs",
-            "schedule": "Wednesdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["charlotte@mergington.edu", "benjamin@mergington.edu"]
-        }
+# Initial activities data, built once at import and used to reset state
+ORIGINAL_ACTIVITIES = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    },
+    "Soccer Team": {
+        "description": "Competitive soccer practices and inter-school matches",
+        "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
+        "max_participants": 20,
+        "participants": ["liam@mergington.edu", "ava@mergington.edu"]
+    },
+    "Basketball Club": {
+        "description": "Skills training, pick-up games, and intramural tournaments",
+        "schedule": "Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 18,
+        "participants": ["mason@mergington.edu", "isabella@mergington.edu"]
+    },
+    "Art Club": {
+        "description": "Explore drawing, painting, and mixed media projects",
+        "schedule": "Mondays, 3:30 PM - 5:00 PM",
+        "max_participants": 15,
+        "participants": ["mia@mergington.edu", "lucas@mergington.edu"]
+    },
+    "Drama Club": {
+        "description": "Acting workshops and stage productions throughout the year",
+        "schedule": "Thursdays, 4:00 PM - 6:00 PM",
+        "max_participants": 25,
+        "participants": ["amelia@mergington.edu", "harper@mergington.edu"]
+    },
+    "Debate Team": {
+        "description": "Prepare for debates, polish public speaking and critical thinking",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 16,
+        "participants": ["ethan@mergington.edu", "oliver@mergington.edu"]
+    },
+    "Science Club": {
+        "description": "Hands-on experiments, STEM projects, and science fairs",
+        "schedule": "Wednesdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["charlotte@mergington.edu", "benjamin@mergington.edu"]
     }
-    
-    # Reset to original state before test
-    activities.clear()
-    activities.update(original_activities)
-    
+}
+
+
+def copy_activity(details):
+    """Copy a single activity, giving it its own participants list"""
+    return {**details, "participants": list(details["participants"])}
+
+
+def copy_activities(source):
+    """Copy activities data, giving each activity its own participants list"""
+    return {name: copy_activity(details) for name, details in source.items()}
+
+
+def restore_activities():
+    """Restore only the activities a test changed back to the original data"""
+    if activities.keys() != ORIGINAL_ACTIVITIES.keys():
+        activities.clear()
+        activities.update(copy_activities(ORIGINAL_ACTIVITIES))
+        return
+
+    for name, details in ORIGINAL_ACTIVITIES.items():
+        if activities[name] != details:
+            activities[name] = copy_activity(details)
+
+
+@pytest.fixture(autouse=True)
+def reset_activities():
+    """Reset activities before and after each test, skipping untouched data"""
+    restore_activities()
     yield
-    
-    # Reset again after test
-    activities.clear()
-    activities.update(original_activities)
+    restore_activities()
+
+
+@pytest.fixture(scope="module")
+def activities_response(client):
+    """Fetch GET /activities once and share the response across read-only tests"""
+    return client.get("/activities")
+
+
+@pytest.fixture(scope="module")
+def activities_snapshot(activities_response):
+    """Parsed body of the shared GET /activities response"""
+    return activities_response.json()
 
 
 class TestRootEndpoint:
@@ -104,11 +142,13 @@ class TestRootEndpoint:
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_activities_returns_all_activities(self, client, reset_activities):
+    def test_get_activities_returns_ok(self, activities_response):
+        """Test that GET /activities succeeds"""
+        assert activities_response.status_code == 200
+    
+    def test_get_activities_returns_all_activities(self, activities_snapshot):
         """Test that GET /activities returns all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
+        data = activities_snapshot
         
         # Verify we get a dictionary
         assert isinstance(data, dict)
@@ -126,11 +166,9 @@ class TestGetActivities:
         assert "max_participants" in chess_club
         assert "participants" in chess_club
         
-    def test_get_activities_has_correct_participant_data(self, client, reset_activities):
+    def test_get_activities_has_correct_participant_data(self, activities_snapshot):
         """Test that activities have correct participant information"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
+        data = activities_snapshot
         
         chess_club = data["Chess Club"]
         assert len(chess_club["participants"]) == 2
@@ -140,71 +178,62 @@ class TestGetActivities:
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_success(self, client, reset_activities):
-        """Test successful signup for an activity"""
-        response = client.post("/activities/Chess Club/signup?email=newstudent@mergington.edu")
+    @pytest.mark.parametrize("signup_url, activity_name", [
+        pytest.param(CHESS_SIGNUP_URL, "Chess Club", id="chess_club"),
+        pytest.param(build_signup_url("Programming Class"), "Programming Class", id="encoded_space_in_name"),
+    ])
+    def test_signup_success(self, client, signup_url, activity_name):
+        """Test successful signup for an activity, including URL encoded names"""
+        response = client.post(signup_url)
         assert response.status_code == 200
         data = response.json()
         
         assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
-        assert "Chess Club" in data["message"]
+        assert NEW_STUDENT_EMAIL in data["message"]
+        assert activity_name in data["message"]
         
         # Verify student was added
         activities_response = client.get("/activities")
         activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Chess Club"]["participants"]
+        assert NEW_STUDENT_EMAIL in activities_data[activity_name]["participants"]
     
-    def test_signup_for_nonexistent_activity(self, client, reset_activities):
+    def test_signup_for_nonexistent_activity(self, client):
         """Test signup for an activity that doesn't exist"""
         response = client.post("/activities/Fake Club/signup?email=student@mergington.edu")
         assert response.status_code == 404
         data = response.json()
         assert "Activity not found" in data["detail"]
     
-    def test_signup_duplicate_student(self, client, reset_activities):
+    def test_signup_duplicate_student(self, client):
         """Test that a student cannot sign up twice for the same activity"""
-        # Sign up once
-        response1 = client.post("/activities/Chess Club/signup?email=newstudent@mergington.edu")
-        assert response1.status_code == 200
+        # Arrange an existing signup directly
+        activities["Chess Club"]["participants"].append(NEW_STUDENT_EMAIL)
         
         # Try to sign up again
-        response2 = client.post("/activities/Chess Club/signup?email=newstudent@mergington.edu")
-        assert response2.status_code == 400
-        data = response2.json()
+        response = client.post(CHESS_SIGNUP_URL)
+        assert response.status_code == 400
+        data = response.json()
         assert "already signed up" in data["detail"]
     
-    def test_signup_with_special_characters_in_activity_name(self, client, reset_activities):
-        """Test signup with URL encoded activity name"""
-        response = client.post("/activities/Programming%20Class/signup?email=newstudent@mergington.edu")
-        assert response.status_code == 200
+    def test_signup_appends_alongside_existing_participants(self, client):
+        """Test that signup appends a student after participants already in the activity"""
+        # Arrange earlier signups directly
+        activities["Art Club"]["participants"].extend(["student1@mergington.edu", "student2@mergington.edu"])
+        expected_participants = activities["Art Club"]["participants"] + ["student3@mergington.edu"]
         
-        # Verify student was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Programming Class"]["participants"]
-    
-    def test_signup_multiple_students_to_same_activity(self, client, reset_activities):
-        """Test that multiple students can sign up for the same activity"""
-        students = ["student1@mergington.edu", "student2@mergington.edu", "student3@mergington.edu"]
-        
-        for student in students:
-            response = client.post(f"/activities/Art Club/signup?email={student}")
-            assert response.status_code == 200
+        response = client.post("/activities/Art Club/signup?email=student3@mergington.edu")
+        assert response.status_code == 200
         
-        # Verify all students were added
+        # Verify the student was appended after the existing participants
         activities_response = client.get("/activities")
         activities_data = activities_response.json()
-        art_club_participants = activities_data["Art Club"]["participants"]
-        
-        for student in students:
-            assert student in art_club_participants
+        assert activities_data["Art Club"]["participants"] == expected_participants
     
-    def test_signup_respects_existing_participants(self, client, reset_activities):
+    def test_signup_respects_existing_participants(self, client):
         """Test that existing participants are preserved when new students sign up"""
         original_participants = activities["Chess Club"]["participants"].copy()
         
-        response = client.post("/activities/Chess Club/signup?email=newstudent@mergington.edu")
+        response = client.post(CHESS_SIGNUP_URL)
         assert response.status_code == 200
         
         # Verify original participants still exist
@@ -215,19 +244,16 @@ class TestSignupForActivity:
         for participant in original_participants:
             assert participant in current_participants
         
-        assert "newstudent@mergington.edu" in current_participants
+        assert NEW_STUDENT_EMAIL in current_participants
 
 
 class TestActivityCapacity:
     """Tests related to activity participant capacity"""
     
-    def test_activity_has_max_participants_field(self, client, reset_activities):
-        """Test that activities have a max_participants field"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
-        
-        for activity_name, activity_data in data.items():
-            assert "max_participants" in activity_data
-            assert isinstance(activity_data["max_participants"], int)
-            assert activity_data["max_participants"] > 0
+    @pytest.mark.parametrize("activity_name", list(ORIGINAL_ACTIVITIES.keys()))
+    def test_activity_has_max_participants_field(self, activities_snapshot, activity_name):
+        """Test that each activity has a max_participants field"""
+        activity_data = activities_snapshot[activity_name]
+        assert "max_participants" in activity_data
+        assert isinstance(activity_data["max_participants"], int)
+        assert activity_data["max_participants"] > 0